@@ -0,0 +1,499 @@
+"""Headless extraction logic for pip's cc=4 HTTP cache entries.
+
+Everything here runs without tkinter, so batch tools and tests can import
+this module with no display and none of the GUI's startup cost.
+"""
+
+import errno
+import mmap
+import os
+import struct
+import sys
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+try:
+    import liburing  # optional, Linux only: batched open/read via io_uring
+except ImportError:
+    liburing = None
+
+# Constants
+MAX_FILE_SIZE_MB = 384
+CHUNK_SIZE = 1024 * 1024
+READ_IN_SIZE = 32
+DETECT_PREFIX_SIZE = 64 * 1024
+OUTPUT_DIR = Path("output")
+
+# Per-indicator header parsers: (bound unpack_from, length offset, body
+# offset). The unpackers are pre-bound C methods, so dispatch is one dict
+# probe and one call with no per-file format interpretation.
+_PARSERS = {
+    0xC5: (struct.Struct(">H").unpack_from, 0x16, 0x18),
+    0xC6: (struct.Struct(">I").unpack_from, 0x16, 0x1A),
+}
+
+# Magic prefix -> output suffix. New formats only need an entry here.
+MAGIC_SUFFIXES = {
+    b'PK\x03\x04': ".whl",
+    b'\x1f\x8b\x08\x00': ".gz",
+    b'\x1f\x8b\x08\x08': ".tgz",
+}
+_METADATA_MAGIC = b'Metadata-Version'
+MAX_MAGIC_LEN = max(len(_METADATA_MAGIC), *map(len, MAGIC_SUFFIXES))
+# Magics grouped by length, so detection is one dict probe per distinct length
+# instead of one startswith call per pattern.
+_MAGIC_BY_LEN = {}
+for _magic, _suffix in MAGIC_SUFFIXES.items():
+    _MAGIC_BY_LEN.setdefault(len(_magic), {})[_magic] = _suffix
+
+def get_default_http_cache_root() -> Path:
+    return Path(os.environ.get("LOCALAPPDATA", "")) / "pip" / "cache" / "http"
+
+def read_cache_header(file_path) -> Optional[bytes]:
+    """Return the first READ_IN_SIZE bytes if ``file_path`` is a cc=4 entry, else None.
+
+    Uses raw os.open/os.read rather than a buffered file object — the probe
+    only ever reads 32 bytes, so the wrapper is pure overhead.
+    """
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        header = os.read(fd, READ_IN_SIZE)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    return header if header.startswith(b"cc=4") else None
+
+def find_wheel_tag_streaming(buf) -> Optional[str]:
+    """Recover ``{dist_info}-{tag}.whl`` by scanning zip local file headers.
+
+    Walks local headers front to back instead of loading the central
+    directory, stopping at the first .dist-info/WHEEL member — typically a
+    few entries in. Returns None whenever the archive needs the central
+    directory (data descriptors, unknown compression, truncation); callers
+    then fall back to reconstruct_whl_filename.
+    """
+    buf = memoryview(buf)
+    pos = 0
+    end = len(buf)
+    while pos + 30 <= end:
+        if bytes(buf[pos:pos + 4]) != b'PK\x03\x04':
+            return None
+        flags, method = struct.unpack_from("<HH", buf, pos + 6)
+        comp_size = struct.unpack_from("<I", buf, pos + 18)[0]
+        name_len, extra_len = struct.unpack_from("<HH", buf, pos + 26)
+        if flags & 0x08:  # sizes live in a trailing data descriptor
+            return None
+        name_start = pos + 30
+        data_start = name_start + name_len + extra_len
+        name = bytes(buf[name_start:name_start + name_len]).decode("utf-8", "replace")
+        if name.endswith(".dist-info/WHEEL"):
+            raw = bytes(buf[data_start:data_start + comp_size])
+            if method == 8:
+                data = zlib.decompressobj(-15).decompress(raw)
+            elif method == 0:
+                data = raw
+            else:
+                return None
+            variable_name = name.split('/')[0].replace('.dist-info', '')
+            for line in data.decode('utf-8', 'replace').splitlines():
+                if line.startswith("Tag:"):
+                    return f"{variable_name}-{line[len('Tag:'):].strip()}.whl"
+            return None
+        pos = data_start + comp_size
+    return None
+
+def reconstruct_whl_filename(zip_path) -> Optional[str]:
+    with open(zip_path, "rb", buffering=65536) as fh, \
+            zipfile.ZipFile(fh, 'r', allowZip64=True) as archive:
+        wheel_info = next((info for info in archive.infolist()
+                           if info.filename.endswith('.dist-info/WHEEL')), None)
+        if wheel_info is None:
+            raise FileNotFoundError("No .dist-info/WHEEL file found in archive.")
+
+        dist_info_folder = wheel_info.filename.split('/')[0]
+        variable_name = dist_info_folder.replace('.dist-info', '')
+
+        with archive.open(wheel_info) as wheel_file:
+            for line_bytes in wheel_file:
+                line = line_bytes.decode('utf-8').strip()
+                if line.startswith("Tag:"):
+                    tag_name = line[len("Tag:"):].strip()
+                    return f"{variable_name}-{tag_name}.whl"
+    return None
+
+def parse_wheel_name(output_file) -> Optional[str]:
+    """Try the streaming local-header scan first, then the zipfile path."""
+    try:
+        with open(output_file, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            name = find_wheel_tag_streaming(mm)
+        if name:
+            return name
+    except Exception:
+        pass
+    return reconstruct_whl_filename(output_file)
+
+_FADV_SEQUENTIAL = getattr(os, "POSIX_FADV_SEQUENTIAL", None)
+_FADV_DONTNEED = getattr(os, "POSIX_FADV_DONTNEED", None)
+
+def _fadvise(fd: int, advice) -> None:
+    """Best-effort posix_fadvise over the whole file; no-op where unsupported."""
+    if advice is not None and hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, advice)
+        except OSError:
+            pass
+
+if hasattr(os, "pread"):
+    _pread = os.pread
+else:
+    def _pread(fd: int, size: int, offset: int) -> bytes:
+        """os.pread substitute for platforms without it (Windows)."""
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, size)
+
+def _copy_body(in_fd: int, out_fd: int, offset: int, length: int) -> int:
+    """Move up to ``length`` bytes from ``in_fd`` at ``offset`` into ``out_fd``.
+
+    Prefers copy_file_range, then sendfile, so the body never passes through
+    a userspace buffer; falls back to a chunked pread/write loop where
+    neither is available (e.g. Windows) or the filesystem refuses. Returns
+    the number of bytes actually copied, which is short of ``length`` when
+    the source ends early (truncated or corrupt entry).
+    """
+    remaining = length
+    src = offset
+    if hasattr(os, "copy_file_range"):
+        try:
+            while remaining > 0:
+                moved = os.copy_file_range(in_fd, out_fd, remaining, offset_src=src)
+                if moved == 0:
+                    break
+                src += moved
+                remaining -= moved
+        except OSError:
+            pass
+        if remaining == 0:
+            return length
+    if hasattr(os, "sendfile"):
+        try:
+            while remaining > 0:
+                moved = os.sendfile(out_fd, in_fd, src, remaining)
+                if moved == 0:
+                    break
+                src += moved
+                remaining -= moved
+        except OSError:
+            pass
+        if remaining == 0:
+            return length
+    while remaining > 0:
+        chunk = _pread(in_fd, min(CHUNK_SIZE, remaining), src)
+        if not chunk:
+            break
+        view = memoryview(chunk)
+        while view:
+            written = os.write(out_fd, view)
+            view = view[written:]
+        src += len(chunk)
+        remaining -= len(chunk)
+    return length - remaining
+
+def iter_cache_files(base: Path):
+    """Yield the path (as str) of every regular file under ``base``.
+
+    Walks with os.scandir so file-ness comes from the directory entry's
+    d_type instead of an extra stat per entry, and no Path object is
+    allocated for entries that end up rejected.
+    """
+    stack = [str(base)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+_URING_DEPTH = 1024
+
+def _uring_open_depth() -> int:
+    """Ring size for the header probe, capped below the fd soft limit.
+
+    A whole chunk's descriptors stay open between the open and close phases,
+    so chunks must be sized well under RLIMIT_NOFILE or opens past the limit
+    come back -EMFILE.
+    """
+    try:
+        import resource
+        soft = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+        if soft == resource.RLIM_INFINITY:
+            return _URING_DEPTH
+    except Exception:
+        return 256
+    return max(8, min(_URING_DEPTH, soft // 2))
+
+def _uring_reap(ring, cqe, count: int) -> dict:
+    """Collect ``count`` completions from the ring, as {user_data: res}."""
+    completions = {}
+    for _ in range(count):
+        liburing.io_uring_wait_cqe(ring, cqe)
+        completions[cqe.user_data] = cqe.res
+        liburing.io_uring_cqe_seen(ring, cqe)
+    return completions
+
+def _read_cache_headers_io_uring(paths: list) -> list:
+    """Read cache headers from many files with batched io_uring syscalls.
+
+    Submits openat, then readv, then close SQEs in chunks of up to
+    ``_URING_DEPTH`` files, so each chunk costs a few submit syscalls instead
+    of three syscalls per file. Any setup or submission error propagates to
+    the caller, which falls back to the sequential probe.
+    """
+    results = [None] * len(paths)
+    retry = []
+    depth = _uring_open_depth()
+    ring = liburing.io_uring()
+    cqe = liburing.io_uring_cqe()
+    sqpoll = getattr(liburing, "IORING_SETUP_SQPOLL", 0)
+    try:
+        liburing.io_uring_queue_init(depth, ring, sqpoll)
+    except OSError:
+        liburing.io_uring_queue_init(depth, ring, 0)
+    try:
+        for start in range(0, len(paths), depth):
+            chunk = paths[start:start + depth]
+
+            for i, path in enumerate(chunk):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_openat(sqe, os.fsencode(path), os.O_RDONLY)
+                sqe.user_data = i
+            liburing.io_uring_submit(ring)
+            opened = _uring_reap(ring, cqe, len(chunk))
+
+            try:
+                # Buffers (and their iovecs) must stay referenced until reaped.
+                reads = {}
+                for i, fd in opened.items():
+                    if fd < 0:
+                        if fd in (-errno.EMFILE, -errno.ENFILE):
+                            # fd pressure, not a bad file — probe it again
+                            # sequentially rather than silently dropping it.
+                            retry.append(start + i)
+                        continue
+                    buf = bytearray(READ_IN_SIZE)
+                    iov = liburing.iovec(buf)
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    liburing.io_uring_prep_readv(sqe, fd, iov, 1, 0)
+                    sqe.user_data = i
+                    reads[i] = (fd, buf, iov)
+                if not reads:
+                    continue
+                liburing.io_uring_submit(ring)
+                read_res = _uring_reap(ring, cqe, len(reads))
+
+                for i, (fd, buf, _iov) in reads.items():
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    liburing.io_uring_prep_close(sqe, fd)
+                    sqe.user_data = i
+                    nread = read_res.get(i, 0)
+                    if nread > 0 and buf.startswith(b"cc=4"):
+                        results[start + i] = bytes(buf[:nread])
+                liburing.io_uring_submit(ring)
+                _uring_reap(ring, cqe, len(reads))
+            except BaseException:
+                # Don't leak a chunk's worth of fds into the fallback path.
+                for fd in opened.values():
+                    if fd >= 0:
+                        try:
+                            os.close(fd)
+                        except OSError:
+                            pass
+                raise
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    for idx in retry:
+        results[idx] = read_cache_header(paths[idx])
+    return results
+
+def read_cache_headers(paths: list) -> list:
+    """Read the header of every path, batching syscalls when possible.
+
+    Returns a list parallel to ``paths``: the first READ_IN_SIZE bytes for
+    cc=4 entries, None for everything else.
+    """
+    if liburing is not None and sys.platform == "linux":
+        try:
+            return _read_cache_headers_io_uring(paths)
+        except Exception:
+            pass
+    if len(paths) > 1:
+        # Overlap the open/read latency across files; pool.map keeps order.
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            return list(pool.map(read_cache_header, paths))
+    return [read_cache_header(path) for path in paths]
+
+def detect_file_type(body, default_name: str) -> str:
+    body = memoryview(body)
+    try:
+        # Only the longest magic ever needs to be materialized here.
+        prefix = bytes(body[:MAX_MAGIC_LEN])
+        for length, table in _MAGIC_BY_LEN.items():
+            suffix = table.get(prefix[:length])
+            if suffix is not None:
+                return default_name + suffix
+        if prefix.startswith(_METADATA_MAGIC):
+            # Name/Version/Classifier sit in the first few KB; decode a
+            # bounded window rather than duplicating the whole body.
+            text = bytes(body[:65536]).decode("utf-8", "replace")
+            name, version, python_version = None, None, None
+
+            for line in text.splitlines():
+                if line.startswith("Name:"):
+                    name = line.split(":", 1)[1].strip()
+                elif line.startswith("Version:"):
+                    version = line.split(":", 1)[1].strip()
+                elif line.startswith("Classifier: Programming Language :: Python ::"):
+                    python_version = line.split("::")[-1].strip()
+
+            if name and version and python_version:
+                return f"{name}-{version}-py{python_version}.metadata.txt"
+            elif name and version:
+                return f"{name}-{version}-py3-none-any.metadata.txt"
+    except Exception as e:
+        print(f"Metadata parsing error: {e}")
+
+    return default_name + ".dat"
+
+def extract_file(file, header: bytes, out_dir: str, allow_large=None) -> Optional[str]:
+    """Extract one cc=4 cache entry into ``out_dir``; return the written path.
+
+    ``allow_large`` is an optional callback deciding whether to extract files
+    over MAX_FILE_SIZE_MB; without one, every file is extracted.
+    """
+    try:
+        file = Path(file)
+        if file.stat().st_size > MAX_FILE_SIZE_MB * 1024 * 1024:
+            if allow_large is not None and not allow_large(file):
+                return None
+
+        if not header.startswith(b"cc=4"):
+            return None
+
+        parser = _PARSERS.get(header[0x15])
+        if parser is None:
+            print(f"Unknown format in {file.name}")
+            return None
+        unpacker, len_offset, body_offset = parser
+        body_length = unpacker(header, len_offset)[0]
+
+        in_fd = os.open(file, os.O_RDONLY)
+        try:
+            # Each cache entry is read start to finish exactly once, so
+            # tell the kernel up front and drop its pages afterwards.
+            _fadvise(in_fd, _FADV_SEQUENTIAL)
+
+            # Only a prefix of the body is needed to pick an output name.
+            prefix_len = min(body_length, DETECT_PREFIX_SIZE)
+            body_prefix = _pread(in_fd, prefix_len, body_offset)
+
+            default_name = file.name.replace(os.sep, "-")
+            final_name = detect_file_type(body_prefix, default_name)
+            out_path = os.path.join(out_dir, final_name)
+
+            out_fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                if body_length > prefix_len and hasattr(os, "posix_fallocate"):
+                    # Reserve the full extent up front so the kernel-side
+                    # copy fills it without incremental extends.
+                    try:
+                        os.posix_fallocate(out_fd, 0, body_length)
+                    except OSError:
+                        pass
+                if body_length <= prefix_len:
+                    # Small bodies (metadata entries) were fully captured
+                    # by the prefix read; one write finishes the file.
+                    os.write(out_fd, body_prefix)
+                else:
+                    copied = _copy_body(in_fd, out_fd, body_offset, body_length)
+                    if copied < body_length:
+                        # Header overstated the body: keep only the real
+                        # bytes, not the preallocated zero padding.
+                        os.ftruncate(out_fd, copied)
+                        print(f"Short body in {file.name}: "
+                              f"expected {body_length} bytes, got {copied}")
+                _fadvise(out_fd, _FADV_DONTNEED)
+            finally:
+                os.close(out_fd)
+            _fadvise(in_fd, _FADV_DONTNEED)
+        finally:
+            os.close(in_fd)
+
+        return out_path
+
+    except Exception as e:
+        print(f"Failed to extract {file}: {e}")
+        return None
+
+def extract_one(file, header: bytes, out_dir: str,
+                allow_large=None, wheel_name=None) -> Optional[str]:
+    """Extract one entry and rename recovered wheels; return the final path.
+
+    ``wheel_name`` lets callers substitute a cached lookup for
+    parse_wheel_name.
+    """
+    output_file = extract_file(file, header, out_dir, allow_large)
+    if output_file is None:
+        return None
+    if output_file.lower().endswith(".whl"):
+        try:
+            reconstructed_name = (wheel_name or parse_wheel_name)(output_file)
+            if reconstructed_name:
+                final_path = os.path.join(out_dir, reconstructed_name)
+                os.replace(output_file, final_path)
+                return final_path
+        except Exception as e:
+            print(f"Failed to reconstruct .whl name: {e}")
+    return output_file
+
+def extract_cache(cache_dir, out_dir, max_workers: Optional[int] = None,
+                  log=None) -> int:
+    """Extract every cc=4 entry under ``cache_dir`` into ``out_dir``.
+
+    Headless equivalent of the GUI's Extract All; returns the number of
+    files written. ``log`` receives one "source -> destination" line per
+    extracted file.
+    """
+    paths = list(iter_cache_files(Path(cache_dir)))
+    entries = [(path, header) for path, header in zip(paths, read_cache_headers(paths))
+               if header is not None]
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+    extracted = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(extract_one, path, header, str(out_dir)): path
+                   for path, header in entries}
+        for future in as_completed(futures):
+            final_path = future.result()
+            if final_path is None:
+                continue
+            extracted += 1
+            if log is not None:
+                log(f"{futures[future]} -> {final_path}")
+    return extracted
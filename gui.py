@@ -0,0 +1,362 @@
+"""Tk front end for the pip cache extractor.
+
+All extraction work lives in core; this module only wires it to widgets,
+worker threads, logging and the persistent wheel-name cache.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+import tkinter as tk
+from tkinter import filedialog, messagebox, font, ttk
+
+from core import (
+    MAX_FILE_SIZE_MB,
+    OUTPUT_DIR,
+    extract_one,
+    get_default_http_cache_root,
+    iter_cache_files,
+    parse_wheel_name,
+    read_cache_headers,
+)
+
+# Constants
+LOG_DIR = Path("logs")
+WHEEL_NAME_CACHE_FILE = LOG_DIR / "wheel_names.json"
+
+LIGHT_THEME = {"bg": "#FFFFFF", "fg": "#000000"}
+DARK_THEME = {"bg": "#2E2E2E", "fg": "#FFFFFF"}
+
+class CacheExtractorApp:
+    def __init__(self, root: tk.Tk):
+        self.root = root
+        self.root.title("Pip Cache Extractor")
+        self.center_window(625, 510)
+        self.root.resizable(False, False)
+
+        self.cache_folder = tk.StringVar(value=str(get_default_http_cache_root()))
+        self.output_folder = tk.StringVar(value=str(OUTPUT_DIR.resolve()))
+
+        self.file_list = []
+        self.is_dark_mode = False
+        self.abort_flag = False
+
+        # One of "ask_once", "always", "never", "per_file".
+        self.large_file_policy = "ask_once"
+        self._policy_lock = threading.Lock()
+
+        self.log_file = self.create_log_file()
+        self._log_fh = open(self.log_file, "a", encoding="utf-8", buffering=1 << 16)
+        self._log_lock = threading.Lock()
+        self._log_queue = deque()
+        threading.Thread(target=self._log_flusher, daemon=True).start()
+
+        self._progress_lock = threading.Lock()
+        self._progress_done = 0
+        self._progress_total = 0
+        self._progress_active = False
+
+        self._wheel_name_cache = self.load_wheel_name_cache()
+        self.setup_ui()
+
+        self.write_log("Program started.")
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+    def create_log_file(self) -> Path:
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        timestamp = int(time.time())
+        log_path = LOG_DIR / f"log-{timestamp}.txt"
+        return log_path
+
+    def load_wheel_name_cache(self) -> dict:
+        try:
+            with open(WHEEL_NAME_CACHE_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def save_wheel_name_cache(self) -> None:
+        try:
+            with open(WHEEL_NAME_CACHE_FILE, "w", encoding="utf-8") as f:
+                json.dump(self._wheel_name_cache, f)
+        except Exception:
+            pass
+
+    def wheel_name_for(self, source, output_file) -> Optional[str]:
+        """parse_wheel_name, cached by the source entry's identity.
+
+        Keyed on (path, mtime_ns, size) of the cache entry so repeat runs over
+        the same cache skip re-parsing the wheel's zip directory entirely.
+        """
+        try:
+            st = os.stat(source)
+            key = f"{source}|{st.st_mtime_ns}|{st.st_size}"
+        except OSError:
+            return parse_wheel_name(output_file)
+        name = self._wheel_name_cache.get(key)
+        if name is None:
+            name = parse_wheel_name(output_file)
+            if name:
+                self._wheel_name_cache[key] = name
+        return name
+
+    def write_log(self, message: str) -> None:
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+        self._log_queue.append(f"[{timestamp}] {message}\n")
+
+    def _log_flusher(self) -> None:
+        """Drain queued log lines to disk twice a second (daemon thread)."""
+        while True:
+            time.sleep(0.5)
+            self._flush_log()
+
+    def _flush_log(self) -> None:
+        lines = []
+        while self._log_queue:
+            lines.append(self._log_queue.popleft())
+        if lines:
+            with self._log_lock:
+                self._log_fh.writelines(lines)
+                self._log_fh.flush()
+
+    def center_window(self, width: int, height: int) -> None:
+        screen_width = self.root.winfo_screenwidth()
+        screen_height = self.root.winfo_screenheight()
+        x = (screen_width // 2) - (width // 2)
+        y = (screen_height // 2) - (height // 2)
+        self.root.geometry(f"{width}x{height}+{x}+{y}")
+
+    def setup_ui(self) -> None:
+        selected_font = font.Font(family='Arial', size=9)
+
+        tk.Label(self.root, font=selected_font, text='Cache Folder:').place(x=18, y=14)
+        tk.Entry(self.root, textvariable=self.cache_folder, width=65).place(x=102, y=18)
+        tk.Button(self.root, text='Browse', command=self.browse_cache).place(x=515, y=14, width=90)
+
+        tk.Label(self.root, font=selected_font, text='Output Folder:').place(x=18, y=44)
+        tk.Entry(self.root, textvariable=self.output_folder, width=65).place(x=102, y=48)
+        tk.Button(self.root, text='Browse', command=self.browse_output).place(x=515, y=44, width=90)
+
+        self.toggle_button = tk.Button(self.root, text='Toggle Dark Mode', command=self.toggle_dark_mode)
+        self.toggle_button.place(x=495, y=74, width=110)
+
+        self.status_label = tk.Label(self.root, font=selected_font, text='')
+        self.status_label.place(x=18, y=78)
+
+        tk.Button(self.root, text='Load Files', command=self.load_files).place(x=268, y=74, width=90)
+
+        frame = tk.Frame(self.root)
+        frame.place(x=5, y=110, width=620, height=280)
+
+        self.listbox = tk.Listbox(frame, selectmode=tk.SINGLE, width=95, height=16)
+        scrollbar = tk.Scrollbar(frame, orient="vertical", command=self.listbox.yview)
+        self.listbox.config(yscrollcommand=scrollbar.set)
+
+        self.listbox.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        tk.Button(self.root, text='Extract Selected', command=self.extract_selected_thread).place(x=78, y=400, width=110)
+        tk.Button(self.root, text='Extract All', command=self.extract_all_thread).place(x=430, y=400, width=110)
+
+        self.abort_button = tk.Button(self.root, text='Abort', command=self.abort_extraction)
+        self.abort_button.place(x=265, y=400, width=90)
+        self.abort_button.config(state=tk.DISABLED)
+
+        self.progress_label = tk.Label(self.root, font=selected_font, text='')
+        self.progress_label.place(x=10, y=440)
+
+        self.progress = ttk.Progressbar(self.root, orient='horizontal', length=600, mode='determinate')
+        self.progress.place(x=10, y=470)
+
+    def toggle_dark_mode(self) -> None:
+        self.is_dark_mode = not self.is_dark_mode
+        theme = DARK_THEME if self.is_dark_mode else LIGHT_THEME
+        self.root.configure(bg=theme["bg"])
+        for widget in self.root.winfo_children():
+            if isinstance(widget, (tk.Label, tk.Button, tk.Entry, tk.Listbox, tk.Frame)):
+                try:
+                    widget.configure(bg=theme["bg"], fg=theme["fg"])
+                except Exception:
+                    pass
+        if self.is_dark_mode:
+            self.toggle_button.config(text='Toggle Light Mode')
+        else:
+            self.toggle_button.config(text='Toggle Dark Mode')
+
+    def browse_cache(self) -> None:
+        folder = filedialog.askdirectory()
+        if folder:
+            self.cache_folder.set(folder)
+
+    def browse_output(self) -> None:
+        folder = filedialog.askdirectory()
+        if folder:
+            self.output_folder.set(folder)
+
+    def load_files(self) -> None:
+        self.listbox.delete(0, tk.END)
+        self.file_list.clear()
+
+        base = Path(self.cache_folder.get())
+        candidates = list(iter_cache_files(base))
+        rel_names = []
+        for path, header in zip(candidates, read_cache_headers(candidates)):
+            if header is not None:
+                self.file_list.append((path, header))
+                rel_names.append(os.path.relpath(path, base))
+
+        # One variadic insert is a single Tcl command, so Tk recalculates
+        # geometry once instead of once per file.
+        if rel_names:
+            self.listbox.insert(tk.END, *rel_names)
+
+        self.status_label.config(text=f"Loaded {len(self.file_list)} files.")
+
+    def extract_selected_thread(self) -> None:
+        threading.Thread(target=self.extract_selected, daemon=True).start()
+
+    def extract_all_thread(self) -> None:
+        threading.Thread(target=self.extract_all, daemon=True).start()
+
+    def abort_extraction(self) -> None:
+        self.abort_flag = True
+        self.write_log("User requested abort.")
+
+    def extract_selected(self) -> None:
+        index = self.listbox.curselection()
+        if not index:
+            messagebox.showwarning("No Selection", "Please select a file to extract.")
+            return
+
+        # A previous aborted Extract All must not veto this run via the
+        # abort check in _process_one.
+        self.abort_flag = False
+
+        file, header = self.file_list[index[0]]
+        out_dir = self.output_folder.get()
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        final_path = self._process_one(file, header, out_dir)
+        if final_path:
+            self.write_log(f"{file} -> {final_path}")
+
+    def extract_all(self) -> None:
+        self.abort_flag = False
+        total = len(self.file_list)
+        self.progress.config(maximum=total, value=0)
+        self.abort_button.config(state=tk.NORMAL)
+
+        out_dir = self.output_folder.get()
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+        self._progress_done = 0
+        self._progress_total = total
+        self._progress_active = True
+        self.root.after(100, self._refresh_progress)
+
+        extracted = 0
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(self._process_one, file, header, out_dir): file
+                       for file, header in self.file_list}
+            for future in as_completed(futures):
+                if self.abort_flag:
+                    for pending in futures:
+                        pending.cancel()
+                if future.cancelled():
+                    continue
+                file = futures[future]
+                final_path = future.result()
+                with self._progress_lock:
+                    self._progress_done += 1
+                if final_path is None:
+                    continue
+                self.write_log(f"{file} -> {final_path}")
+                extracted += 1
+
+        self._progress_active = False
+        self.root.after(0, self._on_all_done, extracted, total)
+
+    def _process_one(self, file, header: bytes, out_dir: str) -> Optional[str]:
+        """Extract one cache file. Runs on a worker thread; must not touch Tk widgets."""
+        if self.abort_flag:
+            return None
+        return extract_one(
+            file, header, out_dir,
+            allow_large=self._allow_large_file,
+            wheel_name=lambda output_file: self.wheel_name_for(file, output_file))
+
+    def _refresh_progress(self) -> None:
+        """Repaint the progress widgets at ~10 Hz rather than once per file."""
+        done = self._progress_done
+        self.progress['value'] = done
+        self.progress_label.config(text=f"Extracting {done} of {self._progress_total} files...")
+        if self._progress_active:
+            self.root.after(100, self._refresh_progress)
+
+    def _on_all_done(self, extracted: int, total: int) -> None:
+        self.abort_button.config(state=tk.DISABLED)
+        if self.abort_flag:
+            self.progress_label.config(text=f"User aborted after {extracted}/{total} files.")
+            self.progress['value'] = 0
+            self.write_log(f"User aborted after {extracted}/{total} files.")
+        else:
+            messagebox.showinfo("Done", f"Extracted {extracted} files.")
+            self.progress_label.config(text=f"Extracted {extracted} files.")
+            self.write_log(f"Extracted {extracted} files.")
+
+    def _ask_on_main_thread(self, prompt: str) -> Optional[bool]:
+        """Show a yes/no/cancel dialog on the Tk thread; block the caller on a queue."""
+        answer = queue.Queue(maxsize=1)
+        self.root.after(0, lambda: answer.put(messagebox.askyesnocancel("Large File", prompt)))
+        return answer.get()
+
+    def _allow_large_file(self, file: Path) -> bool:
+        """Decide whether to extract a large file without per-file UI stalls.
+
+        The first large file of the session prompts once; the answer either
+        covers the whole run ("always"/"never") or opts into per-file
+        prompts. Workers never call messagebox directly — every dialog runs
+        on the Tk event loop via a queue round-trip, so parallel extraction
+        is not serialized on the UI unless the user asked to decide per file.
+        """
+        with self._policy_lock:
+            if self.large_file_policy == "ask_once":
+                choice = self._ask_on_main_thread(
+                    f"{file.name} is over {MAX_FILE_SIZE_MB} MB. Extract large files?\n\n"
+                    "Yes = extract all large files, No = skip all, "
+                    "Cancel = decide per file")
+                if choice is None:
+                    self.large_file_policy = "per_file"
+                elif choice:
+                    self.large_file_policy = "always"
+                else:
+                    self.large_file_policy = "never"
+            policy = self.large_file_policy
+        if policy == "always":
+            return True
+        if policy == "never":
+            return False
+        return bool(self._ask_on_main_thread(f"{file.name} is large. Extract anyway?"))
+
+    def on_closing(self) -> None:
+        self.save_wheel_name_cache()
+        self.write_log("Program closed.")
+        self._flush_log()
+        self._log_fh.close()
+        self.root.destroy()
+
+def main() -> None:
+    root = tk.Tk()
+    CacheExtractorApp(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()